@@ -6,9 +6,10 @@ import requests
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from vector_store import vector_store
+from vector_store import vector_store, MMR_K, MIN_SCORE
 from flatten import load_resume_json, flatten_resume
 from rewrite import to_first_person
+from intent_router import intent_router, SECTIONS, CANNED
 
 # ---------------------------------------
 # Load environment variables
@@ -16,6 +17,10 @@ from rewrite import to_first_person
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Retrieval settings: chunk count for /chat-llm, score floor for /chat and /chat-llm
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", MMR_K))
+RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", MIN_SCORE))
+
 # ---------------------------------------
 # FastAPI Lifespan – Auto Build Index
 # ---------------------------------------
@@ -30,11 +35,13 @@ async def lifespan(app: FastAPI):
     data = load_resume_json()
     chunks = flatten_resume(data)
 
-    vector_store.documents = []
-    for ch in chunks:
-        vector_store.add(ch["text"], ch["metadata"])
+    # chunk_sims: /chat-llm retrieves with search_mmr
+    vector_store.build(chunks, chunk_sims=True)
 
     print(f"✅ Vector index built with {len(vector_store.documents)} chunks.")
+
+    phrase_count = intent_router.load()
+    print(f"✅ Intent router compiled with {phrase_count} phrases.")
     yield  # Server runs after this
 
 
@@ -52,21 +59,6 @@ app.add_middleware(
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 EXAMPLE_PATH = os.path.join(BASE_DIR, "example_resume.json")
 
-# ---------------------------------------
-# Interview Question Trigger List
-# ---------------------------------------
-INTERVIEW_QUESTIONS = [
-    "why should we hire you",
-    "tell me about yourself",
-    "what are your strengths",
-    "what are your weaknesses",
-    "why do you want this job",
-    "why do you want to work here",
-    "what makes you a good fit",
-    "what value do you bring",
-]
-
-
 # ---------------------------------------
 # Root Endpoint
 # ---------------------------------------
@@ -108,13 +100,25 @@ def build_index():
     data = load_resume_json()
     chunks = flatten_resume(data)
 
-    vector_store.documents = []
-    for ch in chunks:
-        vector_store.add(ch["text"], ch["metadata"])
+    # chunk_sims: /chat-llm retrieves with search_mmr
+    vector_store.build(chunks, chunk_sims=True)
 
     return {"status": "ok", "indexed_chunks": len(vector_store.documents)}
 
 
+# ---------------------------------------
+# Reload Intent Table Without Restart
+# ---------------------------------------
+@app.get("/reload_intents")
+def reload_intents():
+    try:
+        phrase_count = intent_router.load()
+    except (FileNotFoundError, ValueError) as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    return {"status": "ok", "intents": len(intent_router.intents), "phrases": phrase_count}
+
+
 # ---------------------------------------
 # Search Only (No LLM)
 # ---------------------------------------
@@ -141,7 +145,7 @@ def search(query: str):
 def chat(query: str):
     results = vector_store.search(query)
 
-    if not results or results[0][0] < 0.10:
+    if not results or results[0][0] < RETRIEVAL_MIN_SCORE:
         return {"answer": "I couldn't find information about that in my resume.", "sources": []}
 
     _, top_doc = results[0]
@@ -155,23 +159,37 @@ def chat(query: str):
 # ---------------------------------------
 @app.get("/chat-llm")
 def chat_llm(query: str):
-    query_lower = query.lower()
-
-    # Interview question → Use full resume
-    if any(q in query_lower for q in INTERVIEW_QUESTIONS):
+    # Known intent → Route to its retrieval strategy
+    intent = intent_router.match(query)
+    if intent is not None:
+        strategy = intent["strategy"]
+
+        if strategy == CANNED:
+            return {"query": query, "answer": intent["answer"], "sources": []}
+
+        if strategy == SECTIONS:
+            docs = [
+                doc for doc in vector_store.documents
+                if doc["metadata"].get("type") in intent["sections"]
+            ]
+            if docs:
+                section_text = " ".join(doc["text"] for doc in docs)
+                return generate_llm_response(query, section_text, sources=[doc["metadata"] for doc in docs])
+
+        # FULL_RESUME, or a section intent with no indexed chunks
         full_resume = " ".join(doc["text"] for doc in vector_store.documents)
         return generate_llm_response(query, full_resume, sources=[])
 
-    # RAG retrieval
-    results = vector_store.search(query)
+    # RAG retrieval → small, diverse set of chunks (MMR)
+    results = vector_store.search_mmr(query, k=RETRIEVAL_K, min_score=RETRIEVAL_MIN_SCORE)
 
-    # Fallback to full resume if retrieval is weak
-    if not results or results[0][0] < 0.10:
+    # Fallback to full resume if no chunk clears the score floor
+    if not results:
         full_resume = " ".join(doc["text"] for doc in vector_store.documents)
         return generate_llm_response(query, full_resume, sources=[])
 
-    _, top_doc = results[0]
-    return generate_llm_response(query, top_doc.get("text", ""), sources=[top_doc.get("metadata", {})])
+    context = " ".join(doc.get("text", "") for _, doc in results)
+    return generate_llm_response(query, context, sources=[doc.get("metadata", {}) for _, doc in results])
 
 
 # ---------------------------------------
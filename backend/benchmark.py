@@ -0,0 +1,106 @@
+"""
+Compare embedding modes of the vector store.
+
+Indexes the example resume with each mode and reports:
+- Search latency (mean per query)
+- Embedding memory footprint
+- Ranking agreement with the bag-of-words baseline (top-k overlap)
+
+Usage:
+    python benchmark.py [--repeat N] [--top-k K]
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+from flatten import load_resume_json, flatten_resume
+from vector_store import VectorStore, BOW, HASHED
+
+QUERIES = [
+    "What machine learning experience do you have?",
+    "Which programming languages do you know?",
+    "Tell me about your genomics projects",
+    "What did you study at university?",
+    "Any publications or research papers?",
+    "What certifications have you earned?",
+    "Do you have leadership experience?",
+    "What awards have you won?",
+    "pythn and tensorflw skills",  # typos
+    "Where are you located?",
+]
+
+
+# ----------------------------------------------------------
+def build_store(chunks: List[Dict], **kwargs) -> VectorStore:
+    store = VectorStore(**kwargs)
+    store.build(chunks)
+    return store
+
+
+def embedding_bytes(store: VectorStore) -> int:
+    """Approximate memory held by the store's embeddings."""
+    if store.mode == HASHED:
+        return store.matrix.nbytes
+
+    total = 0
+    for doc in store.documents:
+        emb = doc["embedding"]
+        total += sys.getsizeof(emb)
+        total += sum(sys.getsizeof(token) + sys.getsizeof(count) for token, count in emb.items())
+    return total
+
+
+def mean_latency_ms(store: VectorStore, repeat: int, top_k: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in QUERIES:
+            store.search(q, top_k=top_k)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(QUERIES))
+
+
+def top_ids(store: VectorStore, query: str, top_k: int) -> List[int]:
+    return [id(doc["metadata"]) for _, doc in store.search(query, top_k=top_k)]
+
+
+# ----------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks = flatten_resume(load_resume_json())
+
+    configs = {
+        "bow": dict(mode=BOW),
+        "hashed": dict(mode=HASHED),
+        "hashed+3gram": dict(mode=HASHED, ngram=3),
+    }
+    stores = {name: build_store(chunks, **cfg) for name, cfg in configs.items()}
+    baseline = stores["bow"]
+
+    print(f"{len(chunks)} chunks, {len(QUERIES)} queries, top_k={args.top_k}\n")
+    print(f"{'mode':<14}{'latency (ms)':>14}{'memory (KB)':>14}{'top-1 agree':>14}{'top-k overlap':>15}")
+
+    for name, store in stores.items():
+        top1 = 0
+        overlap = 0.0
+        for q in QUERIES:
+            base = top_ids(baseline, q, args.top_k)
+            ours = top_ids(store, q, args.top_k)
+            top1 += bool(base and ours and base[0] == ours[0])
+            overlap += len(set(base) & set(ours)) / max(len(base), 1)
+
+        print(
+            f"{name:<14}"
+            f"{mean_latency_ms(store, args.repeat, args.top_k):>14.3f}"
+            f"{embedding_bytes(store) / 1024:>14.1f}"
+            f"{top1 / len(QUERIES):>14.0%}"
+            f"{overlap / len(QUERIES):>15.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,9 @@
 Lightweight text embedding and similarity module.
 
 This module provides:
-- Tokenization
+- Tokenization (plus content-token extraction for retrieval)
 - Bag-of-words embedding (word frequency vector)
+- Hashed embedding (fixed-width float32 vector, optional char n-grams)
 - Cosine similarity scoring
 
 Used by the vector store for simple, fast semantic search.
@@ -11,8 +12,33 @@ Used by the vector store for simple, fast semantic search.
 
 import math
 import re
+import zlib
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Default width of hashed embeddings
+HASH_DIM = 4096
+
+# Function words that carry no retrieval signal. Without this, a query
+# like "what did you do" scores against every chunk via "you"/"do" alone.
+STOPWORDS = frozenset("""
+a about all also am an and any are as at be been being but by can could did do does
+doing done for from had has have having he her here him his how i if in into is it
+its just me more most my no not of on or our out over please she so some such tell
+than that the their them then there these they this those to too up us very was we
+were what when where which while who whom why will with would you your yours
+""".split())
+
+# (suffix, replacement) rules so simple inflections match
+# ("certifications" / "certification", "located" / "location",
+# "studies" / "study"). Checked in order; the first match wins.
+SUFFIXES = (
+    ("ies", "y"), ("ied", "y"),
+    ("ings", ""), ("ions", ""), ("ing", ""), ("ion", ""),
+    ("ed", ""), ("s", ""),
+)
 
 
 # ----------------------------------------------
@@ -36,6 +62,35 @@ def tokenize(text: str) -> List[str]:
     return cleaned.split()
 
 
+def stem(token: str) -> str:
+    """
+    Rewrite one common English suffix, keeping a stem of at least 3 characters.
+
+    Deliberately crude: both queries and chunks go through the same
+    rule, so consistency matters more than linguistic accuracy.
+    """
+    if token.endswith("ss"):
+        return token
+
+    for suffix, replacement in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def content_tokens(text: str) -> List[str]:
+    """
+    Tokens used for retrieval: stopwords removed, suffixes stripped.
+
+    Args:
+        text: Raw input text
+
+    Returns:
+        List of stemmed content tokens
+    """
+    return [stem(token) for token in tokenize(text) if token not in STOPWORDS]
+
+
 # ----------------------------------------------
 # Embedding Function
 # ----------------------------------------------
@@ -43,6 +98,9 @@ def embed_text(text: str) -> Dict[str, int]:
     """
     Create a simple bag-of-words embedding using term frequency.
 
+    Only content tokens are counted, so stopword overlap alone
+    cannot push a chunk over the retrieval score floor.
+
     Args:
         text: Input text to embed
 
@@ -50,33 +108,110 @@ def embed_text(text: str) -> Dict[str, int]:
         A dictionary mapping token -> count
         (Acts as a sparse vector)
     """
-    tokens = tokenize(text)
+    tokens = content_tokens(text)
     return Counter(tokens)
 
 
+# ----------------------------------------------
+# Hashed Embedding Function
+# ----------------------------------------------
+def char_ngrams(token: str, n: int = 3) -> List[str]:
+    """
+    Split a token into overlapping character n-grams.
+
+    The token is padded with boundary markers so prefixes and
+    suffixes get their own features (e.g. "<py", "on>").
+
+    Args:
+        token: Single normalized token
+        n: N-gram length
+
+    Returns:
+        List of n-gram strings
+    """
+    padded = f"<{token}>"
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def embed_hashed(text: str, dim: int = HASH_DIM, ngram: int = 0) -> np.ndarray:
+    """
+    Create a fixed-width embedding using the signed hashing trick.
+
+    Each feature (token, plus character n-grams when enabled) is hashed
+    into one of `dim` buckets with a +/-1 sign to reduce collision bias.
+    The result is L2-normalized so a plain dot product is cosine similarity.
+
+    Args:
+        text: Input text to embed
+        dim: Number of buckets (vector width)
+        ngram: Character n-gram length for typo tolerance (0 disables)
+
+    Returns:
+        A float32 numpy array of shape (dim,)
+    """
+    buckets: List[int] = []
+    signs: List[float] = []
+
+    for token in content_tokens(text):
+        features = [token]
+        if ngram:
+            features.extend(char_ngrams(token, ngram))
+
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            buckets.append(h % dim)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+
+    # Accumulate all features in one vectorized pass
+    vec = np.bincount(buckets, weights=signs, minlength=dim).astype(np.float32)
+
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
 # ----------------------------------------------
 # Cosine Similarity
 # ----------------------------------------------
-def cosine_similarity(vec1: Dict[str, int], vec2: Dict[str, int]) -> float:
+def sparse_dot(vec1: Dict[str, int], vec2: Dict[str, int]) -> float:
+    """Dot product of two sparse BoW vectors (iterates the smaller one)."""
+    if len(vec1) > len(vec2):
+        vec1, vec2 = vec2, vec1
+    return sum(count * vec2.get(token, 0) for token, count in vec1.items())
+
+
+def sparse_norm(vec: Dict[str, int]) -> float:
+    """Euclidean magnitude of a sparse BoW vector."""
+    return math.sqrt(sum(count * count for count in vec.values()))
+
+
+def cosine_similarity(
+    vec1: Dict[str, int],
+    vec2: Dict[str, int],
+    mag1: Optional[float] = None,
+    mag2: Optional[float] = None,
+) -> float:
     """
     Compute cosine similarity between two sparse BoW vectors.
 
     Args:
         vec1: First embedding vector
         vec2: Second embedding vector
+        mag1: Precomputed magnitude of vec1 (computed if omitted)
+        mag2: Precomputed magnitude of vec2 (computed if omitted)
 
     Returns:
         Cosine similarity (0.0–1.0)
     """
-
-    # Dot product
-    dot = sum(count * vec2.get(token, 0) for token, count in vec1.items())
-
-    # Magnitudes
-    mag1 = math.sqrt(sum(count * count for count in vec1.values()))
-    mag2 = math.sqrt(sum(count * count for count in vec2.values()))
+    if mag1 is None:
+        mag1 = sparse_norm(vec1)
+    if mag2 is None:
+        mag2 = sparse_norm(vec2)
 
     if mag1 == 0 or mag2 == 0:
         return 0.0
 
-    return dot / (mag1 * mag2)
+    return sparse_dot(vec1, vec2) / (mag1 * mag2)
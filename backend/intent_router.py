@@ -0,0 +1,208 @@
+"""
+Intent routing for incoming chat queries.
+
+This module provides:
+- Loading a configurable intent table (phrase -> retrieval strategy)
+- An Aho-Corasick automaton compiled over normalized tokens
+- Single-pass matching whose cost is linear in query length,
+  regardless of how many intent phrases are configured
+
+Used by the chat endpoint to decide which context to send to the LLM.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from embed import tokenize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INTENTS_PATH = os.path.join(BASE_DIR, "intents.json")
+
+# Supported retrieval strategies
+FULL_RESUME = "full_resume"
+SECTIONS = "sections"
+CANNED = "canned"
+STRATEGIES = (FULL_RESUME, SECTIONS, CANNED)
+
+
+# ----------------------------------------------
+# Intent Table Loading
+# ----------------------------------------------
+def load_intents(path: str = DEFAULT_INTENTS_PATH) -> List[Dict[str, Any]]:
+    """
+    Load and validate the intent table from disk.
+
+    Each entry looks like:
+        {"phrases": [...], "strategy": "full_resume" | "sections" | "canned",
+         "sections": [...],   # required for "sections"
+         "answer": "..."}     # required for "canned"
+
+    Args:
+        path: Path to the intents JSON file
+
+    Returns:
+        List of intent dictionaries
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a well-formed intent table
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found")
+
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+
+    if not isinstance(table, dict):
+        raise ValueError("Intent table must be a JSON object with an 'intents' list")
+
+    intents = table.get("intents", [])
+    if not isinstance(intents, list):
+        raise ValueError("'intents' must be a list")
+
+    for i, intent in enumerate(intents):
+        if not isinstance(intent, dict):
+            raise ValueError(f"Intent {i}: must be an object")
+
+        phrases = intent.get("phrases", [])
+        if not isinstance(phrases, list) or not all(isinstance(p, str) for p in phrases):
+            raise ValueError(f"Intent {i}: 'phrases' must be a list of strings")
+
+        strategy = intent.get("strategy")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Intent {i}: unknown strategy {strategy!r}")
+        if strategy == SECTIONS and not (
+            isinstance(intent.get("sections"), list) and intent["sections"]
+        ):
+            raise ValueError(f"Intent {i}: 'sections' strategy requires a 'sections' list")
+        if strategy == CANNED and not (isinstance(intent.get("answer"), str) and intent["answer"]):
+            raise ValueError(f"Intent {i}: 'canned' strategy requires an 'answer'")
+
+    return intents
+
+
+# ----------------------------------------------
+# Aho-Corasick Automaton
+# ----------------------------------------------
+class IntentRouter:
+    """
+    Multi-pattern phrase matcher over token sequences.
+
+    The intent table is compiled once into an Aho-Corasick automaton
+    (goto / failure / output tables). Matching walks the query tokens
+    exactly once, so the cost does not grow with the number of phrases.
+    """
+
+    def __init__(self, path: str = DEFAULT_INTENTS_PATH):
+        self.path = path
+        self.intents: List[Dict[str, Any]] = []
+        # (goto, fail, output, intents) – replaced as a whole on reload
+        self._automaton: Tuple[Any, ...] = ([{}], [0], [None], [])
+
+    # ----------------------------------------------------------
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        (Re)build the automaton from the intent table.
+
+        The new automaton is built fully before being swapped in, so
+        requests in flight keep matching against the previous one.
+
+        Parameters:
+        - path (str): Optional new intents file location.
+
+        Returns:
+        Number of phrases compiled.
+        """
+        if path is not None:
+            self.path = path
+
+        intents = load_intents(self.path)
+
+        goto: List[Dict[str, int]] = [{}]
+        output: List[Optional[Tuple[int, int]]] = [None]
+        phrase_count = 0
+
+        # Build the trie; output holds (phrase_length, intent_index)
+        for idx, intent in enumerate(intents):
+            for phrase in intent.get("phrases", []):
+                tokens = tokenize(phrase)
+                if not tokens:
+                    continue
+
+                node = 0
+                for token in tokens:
+                    nxt = goto[node].get(token)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][token] = nxt
+                        goto.append({})
+                        output.append(None)
+                    node = nxt
+
+                # First intent defining a phrase wins
+                if output[node] is None:
+                    output[node] = (len(tokens), idx)
+                phrase_count += 1
+
+        # Breadth-first pass to compute failure links, folding the
+        # longest match reachable through the failure chain into output
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+
+            for token, child in goto[node].items():
+                f = fail[node]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(token, 0)
+
+                inherited = output[fail[child]]
+                if inherited is not None and (output[child] is None or inherited[0] > output[child][0]):
+                    output[child] = inherited
+
+                queue.append(child)
+
+        self.intents = intents
+        self._automaton = (goto, fail, output, intents)
+        return phrase_count
+
+    # ----------------------------------------------------------
+    def match(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the intent whose phrase best matches the query.
+
+        The longest matching phrase wins; ties go to the earliest match.
+
+        Parameters:
+        - query (str): Raw user query.
+
+        Returns:
+        The matched intent dictionary, or None.
+        """
+        goto, fail, output, intents = self._automaton
+
+        node = 0
+        best: Optional[Tuple[int, int]] = None
+
+        for token in tokenize(query):
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+
+            hit = output[node]
+            if hit is not None and (best is None or hit[0] > best[0]):
+                best = hit
+
+        if best is None:
+            return None
+        return intents[best[1]]
+
+
+# ----------------------------------------------------------
+# Singleton instance used throughout the backend
+# ----------------------------------------------------------
+intent_router = IntentRouter(os.getenv("INTENTS_PATH", DEFAULT_INTENTS_PATH))
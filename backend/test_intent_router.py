@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from intent_router import IntentRouter, load_intents, DEFAULT_INTENTS_PATH
+
+
+# ----------------------------------------------
+# Helpers
+# ----------------------------------------------
+def write_table(tmp_path, table) -> str:
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps(table), encoding="utf-8")
+    return str(path)
+
+
+def make_router(tmp_path, intents) -> IntentRouter:
+    router = IntentRouter()
+    router.load(write_table(tmp_path, {"intents": intents}))
+    return router
+
+
+# ----------------------------------------------
+# Matching
+# ----------------------------------------------
+def test_default_table_loads():
+    router = IntentRouter(DEFAULT_INTENTS_PATH)
+    assert router.load() == 8
+    assert router.match("So, why should we hire you?")["strategy"] == "full_resume"
+    assert router.match("What programming languages do you know?") is None
+
+
+def test_phrase_in_middle_of_query(tmp_path):
+    router = make_router(tmp_path, [
+        {"phrases": ["tell me about yourself"], "strategy": "full_resume"},
+    ])
+
+    assert router.match("Hi there, could you tell me about yourself please?") is not None
+    assert router.match("tell me about your projects") is None
+
+
+def test_longer_overlapping_phrase_wins(tmp_path):
+    router = make_router(tmp_path, [
+        {"phrases": ["c"], "strategy": "canned", "answer": "short"},
+        {"phrases": ["b c"], "strategy": "canned", "answer": "middle"},
+        {"phrases": ["a b c d"], "strategy": "canned", "answer": "long"},
+    ])
+
+    assert router.match("a b c d")["answer"] == "long"
+    # Failure link from the "a b c" branch must still find "b c"
+    assert router.match("a b c e")["answer"] == "middle"
+    assert router.match("x c")["answer"] == "short"
+    assert router.match("a b x") is None
+
+
+def test_duplicate_phrase_first_intent_wins(tmp_path):
+    router = make_router(tmp_path, [
+        {"phrases": ["contact"], "strategy": "sections", "sections": ["basics"]},
+        {"phrases": ["contact"], "strategy": "canned", "answer": "Email me."},
+    ])
+
+    assert router.match("how do I contact you")["strategy"] == "sections"
+
+
+def test_reload_replaces_table(tmp_path):
+    router = make_router(tmp_path, [{"phrases": ["old phrase"], "strategy": "full_resume"}])
+    router.load(write_table(tmp_path, {"intents": [{"phrases": ["new phrase"], "strategy": "full_resume"}]}))
+
+    assert router.match("old phrase") is None
+    assert router.match("new phrase") is not None
+
+
+# ----------------------------------------------
+# Validation
+# ----------------------------------------------
+@pytest.mark.parametrize("table", [
+    [],
+    {"intents": {}},
+    {"intents": ["tell me about yourself"]},
+    {"intents": [{"phrases": "tech stack", "strategy": "full_resume"}]},
+    {"intents": [{"phrases": ["ok", 3], "strategy": "full_resume"}]},
+    {"intents": [{"phrases": ["ok"], "strategy": "unknown"}]},
+    {"intents": [{"phrases": ["ok"], "strategy": "sections"}]},
+    {"intents": [{"phrases": ["ok"], "strategy": "sections", "sections": "skills"}]},
+    {"intents": [{"phrases": ["ok"], "strategy": "canned"}]},
+    {"intents": [{"phrases": ["ok"], "strategy": "canned", "answer": 3}]},
+])
+def test_invalid_table_raises_value_error(tmp_path, table):
+    with pytest.raises(ValueError):
+        load_intents(write_table(tmp_path, table))
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_intents(str(tmp_path / "missing.json"))
+
+
+def test_failed_reload_keeps_previous_table(tmp_path):
+    router = make_router(tmp_path, [{"phrases": ["keep me"], "strategy": "full_resume"}])
+
+    with pytest.raises(ValueError):
+        router.load(write_table(tmp_path, {"intents": ["bad"]}))
+    assert router.match("keep me") is not None
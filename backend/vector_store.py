@@ -1,32 +1,117 @@
-from typing import List, Dict, Tuple
-from embed import embed_text, cosine_similarity
+import os
+from typing import Any, List, Dict, Optional, Tuple
+
+import numpy as np
+
+from embed import embed_text, embed_hashed, cosine_similarity, sparse_norm, HASH_DIM
+
+# Supported embedding modes
+BOW = "bow"
+HASHED = "hashed"
+
+# Default multi-chunk (MMR) retrieval settings
+MMR_K = 4
+MIN_SCORE = 0.05
+MMR_LAMBDA = 0.7
+MMR_FETCH_K = 12
 
 
 class VectorStore:
     """
     Simple in-memory vector store for semantic search using cosine similarity.
     Stores text chunks along with metadata and precomputed embeddings.
+
+    Modes:
+    - "bow": sparse Counter embeddings scored one document at a time.
+    - "hashed": fixed-width float32 embeddings kept in one contiguous
+      matrix, so the whole corpus is scored with a single dot product.
+      The matrix holds dim × chunks floats regardless of vocabulary.
+
+    When built with chunk_sims=True (needed by search_mmr), an extra
+    chunks × chunks similarity matrix is kept alongside the embeddings.
+
+    The index is an immutable (documents, matrix, chunk_sims) snapshot
+    that is rebuilt off to the side and swapped in as a whole, so
+    concurrent searches always see a consistent index.
     """
 
-    def __init__(self):
-        self.documents: List[Dict] = []
+    def __init__(self, mode: str = BOW, dim: int = HASH_DIM, ngram: int = 0):
+        if mode not in (BOW, HASHED):
+            raise ValueError(f"Unknown embedding mode: {mode!r}")
+
+        self.mode = mode
+        self.dim = dim
+        self.ngram = ngram
+
+        # (documents, matrix, chunk_sims) – replaced as a whole on rebuild
+        self._index: Tuple[List[Dict], np.ndarray, Optional[np.ndarray]] = self._empty_index()
+
+    # ----------------------------------------------------------
+    @property
+    def documents(self) -> List[Dict]:
+        """Indexed chunks (text + metadata)."""
+        return self._index[0]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Hashed embeddings, row i belongs to documents[i] (empty in bow mode)."""
+        return self._index[1]
+
+    # ----------------------------------------------------------
+    def clear(self):
+        """Remove all documents and embeddings."""
+        self._index = self._empty_index()
+
+    # ----------------------------------------------------------
+    def build(self, chunks: List[Dict[str, Any]], chunk_sims: bool = False) -> int:
+        """
+        Embed a batch of chunks and swap them in as the new index.
+
+        Parameters:
+        - chunks (list): Dicts with "text" and "metadata" (as produced by flatten_resume).
+        - chunk_sims (bool): Also precompute the chunk-to-chunk similarity
+          matrix used by search_mmr().
+
+        Returns:
+        Number of indexed chunks.
+        """
+        documents: List[Dict] = []
+        rows: List[np.ndarray] = []
+
+        for ch in chunks:
+            doc, row = self._embed_chunk(ch["text"], ch["metadata"])
+            documents.append(doc)
+            if row is not None:
+                rows.append(row)
+
+        # Stacked exactly once: dim × chunks floats and nothing more
+        matrix = np.vstack(rows) if rows else np.zeros((0, self.dim), dtype=np.float32)
+        sims = self._compute_chunk_sims(documents, matrix) if chunk_sims else None
+
+        self._index = (documents, matrix, sims)
+        return len(documents)
 
     # ----------------------------------------------------------
     def add(self, text: str, metadata: Dict):
         """
-        Add a text chunk + metadata to the vector store.
+        Add a single text chunk + metadata to the vector store.
+
+        The snapshot is copied and swapped, so prefer build() for bulk loads.
 
         Parameters:
         - text (str): Raw text to embed.
         - metadata (dict): Extra information (e.g., resume section).
         """
-        embedding = embed_text(text)
+        documents, matrix, sims = self._index
+        doc, row = self._embed_chunk(text, metadata)
 
-        self.documents.append({
-            "text": text,
-            "metadata": metadata,
-            "embedding": embedding,
-        })
+        documents = documents + [doc]
+        if row is not None:
+            matrix = np.vstack([matrix, row])
+        if sims is not None:
+            sims = self._compute_chunk_sims(documents, matrix)
+
+        self._index = (documents, matrix, sims)
 
     # ----------------------------------------------------------
     def search(self, query: str, top_k: int = 3) -> List[Tuple[float, Dict]]:
@@ -40,22 +125,132 @@ class VectorStore:
         Returns:
         List of tuples → (similarity_score, document_dict)
         """
-        if not self.documents:
+        documents, matrix, _ = self._index
+        if not documents:
             return []
 
+        sims = self._score(query, documents, matrix)
+        return [(float(sims[i]), documents[i]) for i in self._top_indices(sims, top_k)]
+
+    # ----------------------------------------------------------
+    def search_mmr(
+        self,
+        query: str,
+        k: int = MMR_K,
+        min_score: float = MIN_SCORE,
+        lambda_mult: float = MMR_LAMBDA,
+        fetch_k: int = MMR_FETCH_K,
+    ) -> List[Tuple[float, Dict]]:
+        """
+        Retrieve a small, diverse set of chunks using maximal marginal relevance.
+
+        Each step picks the candidate maximizing
+            lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected)
+        using the chunk-to-chunk similarity matrix precomputed by build().
+
+        Parameters:
+        - query (str): User query to embed + compare.
+        - k (int): Maximum number of chunks to return.
+        - min_score (float): Candidates below this query similarity are dropped.
+        - lambda_mult (float): 1.0 = pure relevance, 0.0 = pure diversity.
+        - fetch_k (int): Number of top candidates considered for selection.
+
+        Returns:
+        List of tuples → (similarity_score, document_dict), in selection order
+        """
+        documents, matrix, chunk_sims = self._index
+        if not documents:
+            return []
+        if chunk_sims is None:
+            raise RuntimeError("Chunk similarities not built; call build(chunks, chunk_sims=True)")
+
+        sims = self._score(query, documents, matrix)
+        candidates = [i for i in self._top_indices(sims, max(fetch_k, k)) if sims[i] >= min_score]
+        if not candidates:
+            return []
+
+        selected: List[int] = []
+
+        # Highest running similarity of each candidate to anything selected
+        redundancy = np.zeros(len(documents), dtype=chunk_sims.dtype)
+
+        while candidates and len(selected) < k:
+            best = max(candidates, key=lambda i: lambda_mult * sims[i] - (1 - lambda_mult) * redundancy[i])
+            selected.append(best)
+            candidates.remove(best)
+            np.maximum(redundancy, chunk_sims[best], out=redundancy)
+
+        return [(float(sims[i]), documents[i]) for i in selected]
+
+    # ----------------------------------------------------------
+    def _empty_index(self) -> Tuple[List[Dict], np.ndarray, Optional[np.ndarray]]:
+        return [], np.zeros((0, self.dim), dtype=np.float32), None
+
+    # ----------------------------------------------------------
+    def _embed_chunk(self, text: str, metadata: Dict) -> Tuple[Dict, Optional[np.ndarray]]:
+        """Embed one chunk → (document_dict, hashed_row or None)."""
+        if self.mode == HASHED:
+            row = embed_hashed(text, self.dim, self.ngram)
+            return {"text": text, "metadata": metadata}, row
+
+        embedding = embed_text(text)
+        return {
+            "text": text,
+            "metadata": metadata,
+            "embedding": embedding,
+            "norm": sparse_norm(embedding),
+        }, None
+
+    # ----------------------------------------------------------
+    def _score(self, query: str, documents: List[Dict], matrix: np.ndarray) -> np.ndarray:
+        """Query-to-chunk cosine similarity for every document."""
+        # Hashed rows are L2-normalized: one matrix-vector product
+        if self.mode == HASHED:
+            return matrix @ embed_hashed(query, self.dim, self.ngram)
+
         query_vec = embed_text(query)
-        scores = []
+        query_norm = sparse_norm(query_vec)
+        sims = np.zeros(len(documents), dtype=np.float64)
+
+        for i, doc in enumerate(documents):
+            sims[i] = cosine_similarity(query_vec, doc["embedding"], query_norm, doc["norm"])
+        return sims
 
-        for doc in self.documents:
-            sim = cosine_similarity(query_vec, doc["embedding"])
-            scores.append((sim, doc))
+    # ----------------------------------------------------------
+    @staticmethod
+    def _top_indices(sims: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k scores, highest first (ties keep insertion order)."""
+        k = min(top_k, len(sims))
+        if k <= 0:
+            return np.zeros(0, dtype=np.intp)
+
+        # Partial selection, then sort only the top_k candidates
+        top = np.argpartition(-sims, k - 1)[:k]
+        return top[np.lexsort((top, -sims[top]))]
+
+    # ----------------------------------------------------------
+    def _compute_chunk_sims(self, documents: List[Dict], matrix: np.ndarray) -> np.ndarray:
+        """n × n chunk-to-chunk cosine similarity matrix."""
+        if self.mode == HASHED:
+            return matrix @ matrix.T
 
-        # Sort by highest similarity
-        scores.sort(key=lambda x: x[0], reverse=True)
-        return scores[:top_k]
+        n = len(documents)
+        chunk_sims = np.eye(n, dtype=np.float64)
+        for i in range(n):
+            doc_i = documents[i]
+            for j in range(i + 1, n):
+                doc_j = documents[j]
+                chunk_sims[i, j] = chunk_sims[j, i] = cosine_similarity(
+                    doc_i["embedding"], doc_j["embedding"], doc_i["norm"], doc_j["norm"]
+                )
+        return chunk_sims
 
 
 # ----------------------------------------------------------
 # Singleton instance used throughout the backend
 # ----------------------------------------------------------
-vector_store = VectorStore()
+vector_store = VectorStore(
+    mode=os.getenv("EMBEDDING_MODE", BOW),
+    dim=int(os.getenv("EMBEDDING_DIM", HASH_DIM)),
+    ngram=int(os.getenv("EMBEDDING_NGRAM", 0)),
+)